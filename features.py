@@ -7,6 +7,9 @@ POSTGRESQL_DRIVER_NAME = "PostgreSQL"
 GEODATABASE_DRIVER_NAME = "OpenFileGDB"  # "FileGDB"
 SDE_DRIVER_NAME = "SDE"
 
+# drivers by name, filled lazily as looked up
+_DRIVER_CACHE = {}
+
 
 def _get_layer(datasource, for_write=False, allow_path=False):
     '''
@@ -54,7 +57,19 @@ def get_driver(path):
     :param path: (str) Filepath or conn string.
     :return: (ogr.Driver)
     '''
-    return ogr.GetDriverByName(guess_driver(path))
+    return _get_driver_by_name(guess_driver(path))
+
+
+def _get_driver_by_name(name):
+    '''
+    Get feature driver by name, reusing the driver instance if already looked up.
+    :param name: (str) OGR driver name.
+    :return: (ogr.Driver)
+    '''
+    driver = _DRIVER_CACHE.get(name)
+    if driver is None:
+        driver = _DRIVER_CACHE[name] = ogr.GetDriverByName(name)
+    return driver
 
 
 def datasource(path_or_datasource, driver_name=None, write=False):
@@ -72,7 +87,7 @@ def get_datasource(path_or_datasource, driver_name=None, write=False):
     '''
     if isinstance(path_or_datasource, ogr.DataSource):
         return path_or_datasource
-    driver = get_driver(path_or_datasource) if driver_name is None else ogr.GetDriverByName(driver_name)
+    driver = get_driver(path_or_datasource) if driver_name is None else _get_driver_by_name(driver_name)
     return driver.Open(path_or_datasource, 1 if write else 0)
 
 
@@ -21,6 +21,42 @@ AREA_SQ_FEET      = 100+LENGTH_FEET
 AREA_SQ_MILE      = 100+LENGTH_MILE
 AREA_HECTARE      = 1255
 AREA_ACRE         = 2255
+# field types (as type or type name) to OGR field type constants
+_OGR_FIELD_TYPES  = {
+    str:         ogr.OFTString,
+    int:         ogr.OFTInteger64,
+    float:       ogr.OFTReal,
+    date:        ogr.OFTDateTime,
+    "String":    ogr.OFTString,
+    "Integer32": ogr.OFTInteger,
+    "Integer64": ogr.OFTInteger64,
+    "Integer":   ogr.OFTInteger64,
+    "Float":     ogr.OFTReal,
+    "Double":    ogr.OFTReal,
+    "Real":      ogr.OFTReal,
+    "DateTime":  ogr.OFTDateTime,
+    "Date":      ogr.OFTDate
+}
+# field types (as type, type name, or OGR field type constant) to ogr.Feature method reading the value
+_FIELD_ACCESSORS  = {
+    str:                "GetFieldAsString",
+    "String":           "GetFieldAsString",
+    ogr.OFTString:      "GetFieldAsString",
+    int:                "GetFieldAsInteger",
+    "Integer":          "GetFieldAsInteger",
+    "Integer32":        "GetFieldAsInteger",
+    "Integer64":        "GetFieldAsInteger",
+    ogr.OFTInteger:     "GetFieldAsInteger",
+    ogr.OFTInteger64:   "GetFieldAsInteger",
+    float:              "GetFieldAsDouble",
+    "Real":             "GetFieldAsDouble",
+    ogr.OFTReal:        "GetFieldAsDouble",
+    date:               "GetFieldAsDateTime",
+    "DateTime":         "GetFieldAsDateTime",
+    "Date":             "GetFieldAsDateTime",
+    ogr.OFTDate:        "GetFieldAsDateTime",
+    ogr.OFTDateTime:    "GetFieldAsDateTime"
+}
 
 
 def definition(datasource, field_name=None):
@@ -42,7 +78,7 @@ def definition(datasource, field_name=None):
     if field_name:
         f_index = defn.GetFieldIndex(field_name)
         if f_index < 0:
-            return None
+            return _final(ds)
         return _final(ds, defn.GetFieldDefn(f_index))
     else:
         fields = []
@@ -92,11 +128,12 @@ def find(datasource, field_name):
     layer, ds = _get_layer(datasource, allow_path=True)
     defn = layer.GetLayerDefn()
     match = False
-    for i in range(defn.GetFieldCount()):
-        fdefn = defn.GetFieldDefn(i)
+    # OGR index lookup is case-insensitive, so confirm exact name
+    f_index = defn.GetFieldIndex(field_name)
+    if f_index >= 0:
+        fdefn = defn.GetFieldDefn(f_index)
         if fdefn.GetName() == field_name:
             match = get(layer, fdefn)
-            break
     if ds:
         ds.Release()
         del ds
@@ -143,16 +180,38 @@ def value(feature, field):
         raise Exception("Must provide common.Field instance as field.")
     if field.is_fid:
         return feature.GetFID()
-    if field.type in ("String", ogr.OFTString, str):
-        return feature.GetFieldAsString(field.index)
-    elif field.type in ("Integer", "Integer32", "Integer64", ogr.OFTInteger, ogr.OFTInteger64, int):
-        return feature.GetFieldAsInteger(field.index)
-    elif field.type in ("Real", ogr.OFTReal, float):
-        return feature.GetFieldAsDouble(field.index)
-    elif field.type in ("DateTime", "Date", ogr.OFTDate, ogr.OFTDateTime, date):
-        return feature.GetFieldAsDateTime(field.index)
-    else:
+    return getattr(feature, _accessor(field))(field.index)
+
+
+def getter(field):
+    '''
+    Get a function that reads the value of a field from a feature, with the field type resolved once up front (for use
+    in place of `value()` when reading the same field across many features).
+    :param field: (common.Field) The field for which to grab the value of.
+    :return: (callback) Function provided ogr.Feature as only parameter and returning the value.
+    '''
+    if not isinstance(field, Field):
+        raise Exception("Must provide common.Field instance as field.")
+    if field.is_fid:
+        return lambda feat: feat.GetFID()
+    accessor = getattr(ogr.Feature, _accessor(field))
+    index    = field.index
+    return lambda feat: accessor(feat, index)
+
+
+def _accessor(field):
+    '''
+    Get the name of the ogr.Feature method reading the value of a (non-FID) field.
+    :param field: (common.Field) The field.
+    :return: (str) The method name.
+    '''
+    try:
+        name = _FIELD_ACCESSORS.get(field.type)
+    except TypeError:
+        name = None
+    if name is None:
         raise Exception("Unrecognized field type: {0}".format(field.type))
+    return name
 
 
 def values(datasource, fields):
@@ -169,28 +228,12 @@ def values(datasource, fields):
     layer, ds = _get_layer(datasource, allow_path=True)
     fields = [get(layer, f) for f in fields]
 
-    def build_lambda(for_field):
-        if not isinstance(for_field, Field):
-            raise Exception("Must provide common.Field instance as field.")
-        if for_field.is_fid:
-            return lambda feat: feat.GetFID()
-        elif for_field.type in ("String", ogr.OFTString, str):
-            return lambda feat: feat.GetFieldAsString(for_field.index)
-        elif for_field.type in ("Integer", "Integer32", "Integer64", ogr.OFTInteger, ogr.OFTInteger64, int):
-            return lambda feat: feat.GetFieldAsInteger(for_field.index)
-        elif for_field.type in ("Real", ogr.OFTReal, float):
-            return lambda feat: feat.GetFieldAsDouble(for_field.index)
-        elif for_field.type in ("DateTime", "Date", ogr.OFTDate, ogr.OFTDateTime, date):
-            return lambda feat: feat.GetFieldAsDateTime(for_field.index)
-        else:
-            raise Exception("Unrecognized field type: {0}".format(for_field.type))
-
-    lambdas = {f.name: build_lambda(f) for f in fields}
+    lambdas = {f.name: getter(f) for f in fields}
 
     fvalues = []
     layer.SetNextByIndex(0)
     for feat in layer:
-        fvalues.append({fname: getter(feat) for fname, getter in lambdas.items()})
+        fvalues.append({fname: get_value(feat) for fname, get_value in lambdas.items()})
     del feat
     layer.SetNextByIndex(0)
 
@@ -232,38 +275,15 @@ def create_definition(name, field_type, width=0, precision=0):
     :param [precision]: (int) The field precision.
     :return: (ogr.FieldDefn)
     '''
-    ogr_type = None
-    if field_type == str:
-        ogr_type = ogr.OFTString
-    elif field_type == int:
-        ogr_type = ogr.OFTInteger64
-    elif field_type == float:
-        ogr_type = ogr.OFTReal
-    elif field_type == date:
-        ogr_type = ogr.OFTDateTime
-    elif isinstance(field_type, str):
-        if field_type == "String":
-            ogr_type = ogr.OFTString
-        elif field_type == "Integer32":
-            ogr_type = ogr.OFTInteger
-        elif field_type == "Integer64":
-            ogr_type = ogr.OFTInteger64
-        elif field_type == "Integer":
-            ogr_type = ogr.OFTInteger64
-        elif field_type == "Float":
-            ogr_type = ogr.OFTReal
-        elif field_type == "Double":
-            ogr_type = ogr.OFTReal
-        elif field_type == "Real":
-            ogr_type = ogr.OFTReal
-        elif field_type == "DateTime":
-            ogr_type = ogr.OFTDateTime
-        elif field_type == "Date":
-            ogr_type = ogr.OFTDate
-        else:
+    if isinstance(field_type, int):
+        ogr_type = field_type
+    else:
+        try:
+            ogr_type = _OGR_FIELD_TYPES.get(field_type)
+        except TypeError:
+            ogr_type = None
+        if ogr_type is None:
             raise Exception("Unknown field type supplied")
-    elif not isinstance(field_type, int):
-        raise Exception("Unknown field type supplied")
     defn = ogr.FieldDefn(name, ogr_type)
     if width:
         defn.SetWidth(width)
@@ -465,6 +485,8 @@ def join(datasource, on_field, join_datasource, to_field, join_fields, error_if_
     del feat
     to_layer.SetNextByIndex(0)
 
+    # existing field names (kept updated as fields are added), for finding a unique name for the join FID field
+    field_names = {f.name for f in list(og_layer)}
     copy_fields = []
     for join_field in join_fields:
         if not join_field.is_fid:
@@ -473,19 +495,22 @@ def join(datasource, on_field, join_datasource, to_field, join_fields, error_if_
         else:
             i = 0
             join_fid_field_name = "JOIN_FID"
-            while exists(og_layer, join_fid_field_name):
+            while join_fid_field_name in field_names:
                 i += 1
                 join_fid_field_name = "JOIN_FID_{0}".format(i)
             copy_fields.append(create(og_layer, join_fid_field_name, int))
+        field_names.add(copy_fields[-1].name)
 
+    field_pairs = _list(zip(join_fields, copy_fields))
     og_layer.SetNextByIndex(0)
     for og_feat in og_layer:
-        join_to = value(og_layer, og_field)
+        join_to = value(og_feat, og_field)
         if join_to not in join_map:
             continue
         join_to_feat = to_layer.GetFeature(join_map[join_to])
-        for f in range(len(join_fields)):
-            set_value(og_feat, copy_fields[f], value(join_to_feat, join_fields[f]))
+        for join_field, copy_field in field_pairs:
+            set_value(og_feat, copy_field, value(join_to_feat, join_field))
+        og_layer.SetFeature(og_feat)
     del og_feat
     og_layer.SetNextByIndex(0)
 
@@ -4,6 +4,11 @@ from .. import features
 from . import reproject
 
 
+# results of spatial reference comparisons keyed by WKT and data axis mapping pairs, as IsSame() does a full semantic
+# comparison
+_SAME_SRS_CACHE = {}
+
+
 def rectify(input_datasource, method_datasource, output_path, tmp_reproj_path, overwrite=False):
     input_layer, ds1 = _get_layer(input_datasource, allow_path=True)
 
@@ -18,7 +23,7 @@ def rectify(input_datasource, method_datasource, output_path, tmp_reproj_path, o
         input_srs = input_layer.GetSpatialRef()
         check_srs = method_layer.GetSpatialRef()
         reproj_ds = None
-        if not input_srs.IsSame(check_srs):
+        if not _is_same_srs(input_srs, check_srs):
             if not tmp_reproj_path:
                 raise Exception("Reprojection required, supply temporary reprojection path (tmp_reproj_path)")
             if os.path.isdir(tmp_reproj_path):
@@ -54,3 +59,15 @@ def cleanup(process_objs, delete_tmp_files):
     if process_objs['ds2']:
         process_objs['ds2'].Release()
         del process_objs['method_layer'], process_objs['ds2']
+
+
+def _is_same_srs(srs1, srs2):
+    # data axis mapping is part of the key, as IsSame() also compares it and WKT does not include it
+    mapping1, mapping2 = tuple(srs1.GetDataAxisToSRSAxisMapping()), tuple(srs2.GetDataAxisToSRSAxisMapping())
+    wkt1, wkt2 = srs1.ExportToWkt(), srs2.ExportToWkt()
+    if wkt1 == wkt2 and mapping1 == mapping2:
+        return True
+    key = (wkt1, mapping1, wkt2, mapping2)
+    if key not in _SAME_SRS_CACHE:
+        _SAME_SRS_CACHE[key] = bool(srs1.IsSame(srs2))
+    return _SAME_SRS_CACHE[key]
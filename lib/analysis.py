@@ -31,13 +31,14 @@ def buffer(input_datasource, buffer_distance, output_path, overwrite=False):
     for i in range(defn.GetFieldCount()):
         fdefn = defn.GetFieldDefn(i)
         buffer_layer.CreateField(fdefn)
-        copyfields.append(fields.get(ds, fdefn))
+        copyfields.append(fields.get(layer, fdefn))
+    buffer_defn = buffer_layer.GetLayerDefn()
 
     layer.SetNextByIndex(0)
     for feat in layer:
         geom = feat.GetGeometryRef()
         buffgeom = geom.Buffer(buffer_distance)
-        bufffeat = ogr.Feature(layer.GetLayerDefn())
+        bufffeat = ogr.Feature(buffer_defn)
         bufffeat.SetGeometry(buffgeom)
         for f in copyfields:
             fields.set_value(bufffeat, f, fields.value(feat, f))
@@ -1 +1 @@
-from . import conversionfeature as feature
\ No newline at end of file
+from . import conversionfeature as feature
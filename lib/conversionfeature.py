@@ -1,17 +1,38 @@
 import numpy
 from PIL import Image, ImageDraw
 from ._getlayer import get as _get_layer
-from .. import rasters as rasterutils
 
 
-def to_geojson(datasource):
+def to_geojson(datasource, out_file=None):
     '''
     Convert a feature datasource to a GeoJSON string.
     :param datasource: (ogr.DataSource) The feature datasource to convert.
-    :return: (str) The GeoJSON string.
+    :param [out_file]: (file) If provided, the GeoJSON is streamed to this (text-mode) file object as it is built
+           instead of being returned as a string.
+    :return: (str) The GeoJSON string (or None if written to file).
     '''
     feat_layer, ds = _get_layer(datasource, allow_path=True)
-    geojson = (
+    feat_layer.ResetReading()
+    if out_file is not None:
+        for chunk in _geojson_chunks(feat_layer):
+            out_file.write(chunk)
+        geojson = None
+    else:
+        geojson = "".join(_geojson_chunks(feat_layer))
+    feat_layer.ResetReading()
+    if ds:
+        ds.Release()
+        del feat_layer, ds
+    return geojson
+
+
+def _geojson_chunks(feat_layer):
+    '''
+    Generate the GeoJSON for a feature layer in pieces, such that the full string is never rebuilt per feature.
+    :param feat_layer: (ogr.Layer) The feature layer.
+    :return: (generator) Generator of GeoJSON string pieces.
+    '''
+    yield (
         '{\n' +
         '  "type": "FeatureCollection", \n' +
         '  "features": [\n'
@@ -20,14 +41,10 @@ def to_geojson(datasource):
     for feature in feat_layer:
         if first:
             first = False
+            yield "    " + feature.ExportToJson()
         else:
-            geojson += ",\n"
-        geojson += "    " + feature.ExportToJson()
-    geojson += "\n  ]\n}"
-    if ds:
-        ds.Release()
-        del feat_layer, ds
-    return geojson
+            yield ",\n    " + feature.ExportToJson()
+    yield "\n  ]\n}"
 
 
 def to_array(feature, origin, pixel_size, resolution):
@@ -64,21 +81,14 @@ def to_array(feature, origin, pixel_size, resolution):
             ring = poly.GetGeometryRef(r)
             if ring.GetGeometryName() != "LINEARRING":
                 raise Exception("LINEARRING geometry expected in POLYGON, " + ring.GetGeometryName() + " geometry found")
-            pixels = []
-            # create pixels from ring
-            for p in range(ring.GetPointCount()):
-                pixels.append(
-                    rasterutils.calc_pixel_coordinate(
-                        [ring.GetX(p), ring.GetY(p)],
-                        origin,
-                        pixel_size
-                    )
-                )
-            # draw ring as polygon (if inner-ring, erase)
-            rasterize.polygon(pixels, 1 if outer else 0)
+            # create pixels from ring (all vertices fetched in one call, truncated toward zero as in
+            # rasters.calc_pixel_coordinate)
+            coords = numpy.asarray(ring.GetPoints() or [], dtype=numpy.float64)
+            if coords.size:
+                px = ((coords[:, 0] - origin[0]) / pixel_size[0]).astype(int)
+                py = ((coords[:, 1] - origin[1]) / pixel_size[1]).astype(int)
+                # draw ring as polygon (if inner-ring, erase)
+                rasterize.polygon(list(zip(px.tolist(), py.tolist())), 1 if outer else 0)
             outer = False
-    # convert image to numpy array
-    poly_array = numpy.array(list(rasterpoly.getdata()))
-    poly_array.shape = resolution[1], resolution[0]
-    # return array
-    return poly_array
+    # convert image to numpy array (read from image buffer directly, already shaped as rows then columns)
+    return numpy.asarray(rasterpoly, dtype=numpy.uint8)
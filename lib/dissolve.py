@@ -186,27 +186,22 @@ def on_field(dataset, output_path, on_fields, singlepart=False, layer_name="diss
     if None in fields:
         raise Exception("One of more fields provided do not exist in dataset.")
 
-    unique_sets = []    
+    unique_sets = []
     feature_groups = []
+    # unique set of values (as hashable tuple) to index of group
+    group_index = {}
 
     f = -1
     layer.SetNextByIndex(0)
     for feat in layer:
         f += 1
         values = [fieldutils.value(feat, field) for field in fields]
+        # datetime values are returned as lists, so convert for hashing
+        key = tuple(tuple(v) if isinstance(v, list) else v for v in values)
 
-        matched = -1
-        for i in range((len(unique_sets))):
-            match = True
-            for k in range(len(fields)):
-                if values[k] != unique_sets[i][k]:
-                    match = False
-                    break
-            if match:
-                matched = i
-                break
-
-        if matched < 0:
+        matched = group_index.get(key)
+        if matched is None:
+            group_index[key] = len(unique_sets)
             unique_sets.append(values)
             feature_groups.append([f])
         else:
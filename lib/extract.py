@@ -1,3 +1,5 @@
+import numpy
+from osgeo import ogr
 from .. import fields
 from .. import features as featutils
 from .. import rasters as rasterutils
@@ -5,30 +7,56 @@ from ._getlayer import get as _get_layer
 from . import conversion
 
 
-def features(input_datasource, validation_func, output_path, overwrite=False):
+def features(input_datasource, validation_func, output_path, overwrite=False, where=None):
     '''
     Extract features from a datasource using a callback function.
     :param input_datasource:  (ogr.DataSource|ogr.Layer|str) The feature datasource to extract from, provided as
            ogr.DataSource, ogr.Layer, or filepath.
     :param validation_func: (callback) The validation function, which returns True if feature is to be extracted, or
-           False if filtered out. Provided ogr.Feature as only parameter.
+           False if filtered out. Provided ogr.Feature as only parameter. Ignored if `where` is supplied.
     :param output_path: (str) The output path to save the extracted features to.
     :param [overwrite=False]: (boolean) If False, throws exception is output path already exists. Otherwise overwrites
            silently.
+    :param [where]: (str) SQL where clause (e.g. "type = 'A'") used in place of the validation function, so filtering
+           is done by the driver (which may use attribute indexes) instead of per feature in Python. Requires the
+           datasource be provided as ogr.DataSource or filepath (not ogr.Layer), as it is run as a separate query so
+           any attribute filter already set on the layer is left untouched.
     :return:
     '''
     input_layer, ds  = _get_layer(input_datasource, allow_path=True)
     input_datasource = input_datasource if not ds else ds
+    if where and not isinstance(input_datasource, ogr.DataSource):
+        raise Exception("Where clause requires datasource provided as ogr.DataSource or filepath, not ogr.Layer")
     output_ds        = featutils.copy_datasource_as_empty(input_datasource, output_path, overwrite)
     output_layer     = output_ds.GetLayer()
-
-    input_layer.SetNextByIndex(0)
-    feat = input_layer.GetNextFeature()
-    while feat:
-        if validation_func(feat):
-            output_layer.CreateFeature(feat)
-        feat = input_layer.GetNextFeature()
-    input_layer.SetNextByIndex(0)
+    output_defn      = output_layer.GetLayerDefn()
+
+    if where:
+        # query as result set (instead of setting attribute filter on the layer, which would replace any filter the
+        # caller has set, as OGR provides no way to read it back to restore it)
+        read_layer = input_datasource.ExecuteSQL(
+            'SELECT * FROM "{0}" WHERE {1}'.format(input_layer.GetName(), where)
+        )
+    else:
+        read_layer = input_layer
+        read_layer.ResetReading()
+    # batch writes in a single transaction (no-op for drivers without transaction support)
+    output_layer.StartTransaction()
+    try:
+        for feat in read_layer:
+            if where or validation_func(feat):
+                out_feat = ogr.Feature(output_defn)
+                out_feat.SetFrom(feat)
+                output_layer.CreateFeature(out_feat)
+        output_layer.CommitTransaction()
+    except Exception:
+        output_layer.RollbackTransaction()
+        raise
+    finally:
+        if where:
+            input_datasource.ReleaseResultSet(read_layer)
+        else:
+            input_layer.ResetReading()
 
     if ds:
         ds.Release()
@@ -60,14 +88,21 @@ def features_with_callback(input_datasource, on_fields, validation_func, output_
     output_layer     = output_ds.GetLayer()
     copy_fields      = [fields.get(input_layer, f) for f in on_fields]
 
-    input_layer.SetNextByIndex(0)
-    feat = input_layer.GetNextFeature()
-    while feat:
-        values = [fields.value(feat, f) for f in copy_fields]
-        if validation_func(values):
-            output_layer.CreateFeature(feat)
+    output_layer.StartTransaction()
+    try:
+        input_layer.SetNextByIndex(0)
         feat = input_layer.GetNextFeature()
-    input_layer.SetNextByIndex(0)
+        while feat:
+            values = [fields.value(feat, f) for f in copy_fields]
+            if validation_func(values):
+                output_layer.CreateFeature(feat)
+            feat = input_layer.GetNextFeature()
+        output_layer.CommitTransaction()
+    except Exception:
+        output_layer.RollbackTransaction()
+        raise
+    finally:
+        input_layer.SetNextByIndex(0)
 
     if ds:
         ds.Release()
@@ -84,18 +119,18 @@ def pixels_by_feature_mask(raster, band, feature, ignore_values=None):
     :param feature: (ogr.Feature) The OGR Feature to define overlap.
     :param [ignore_values]: (float[]) Values to ignore/not-included (can also be callback function provided pixel value
            as only parameter, return True to ignore).
-    :return: Array of pixel values.
+    :return: (numpy.Array) Pixel values as flat array.
     '''
     # get overlapping/snapped window to compare feature and raster
     origin, resolution, offset, pixel_size = feature_to_raster_window(raster, feature)
     if origin is None:
-        return []
+        return numpy.empty(0)
     # rasterize (array-ize?) feature in window
     polyArray = conversion.feature.to_array(feature, origin, pixel_size, resolution)
     return pixels_by_mask_array(raster, band, polyArray, offset, resolution, ignore_values)
 
 
-def pixels_by_mask_array(raster, band, mask, offset, resolution=None, ignore_values=None):
+def pixels_by_mask_array(raster, band, mask, offset, resolution=None, ignore_values=None, pixels=None):
     '''
     Get all pixel-values in raster using a raster/array mask.
     :param raster: (gdal.Dataset) The GDAL Dataset to pull pixel values.
@@ -104,47 +139,60 @@ def pixels_by_mask_array(raster, band, mask, offset, resolution=None, ignore_val
     :param offset: (int[]) The x/y offset of the mask.
     :param [resolution]: (int[]) The pixel width and height of the mask. If not supplied can just be determined from
            shape of input mask array.
-    :param [ignore_values]: (float[]) Values to ignore/not-included (can also be callback function provided pixel value
-           as only parameter, return True to ignore).
-    :return: (float[]) Pixel values as flat list.
+    :param [ignore_values]: (float[]|numpy.Array) Values to ignore/not-included (can also be callback function provided
+           pixel value as only parameter, return True to ignore).
+    :param [pixels]: (numpy.Array) Raster values already read for the mask window (e.g. sliced from a multiband read).
+           If not supplied, the window is read from the raster band.
+    :return: (numpy.Array) Pixel values as flat array.
     '''
     if raster is None or mask is None or offset is None:
-        return []
+        return numpy.empty(0)
     if resolution is None:
         resolution = [mask.shape[1], mask.shape[0]]
     # read raster values in window
-    pixels = rasterutils.read(raster, band, offset[0], offset[1], resolution[0], resolution[1])
-    # empty list of valid pixel values
-    values = []
-    # loop by lines then pixels, pull raster value if feature presence exists
-    for y in range(resolution[1]):
-        for x in range(resolution[0]):
-            m = mask[y][x]  # numpy stores axes backwards somehow
-            if m > 0:
-                v = pixels[y][x]  # numpy stores axes backwards somehow
-                if ignore_values:
-                    if callable(ignore_values):
-                        if not ignore_values(v):
-                            values.append(v)
-                    elif v not in ignore_values:
-                        values.append(v)
-    return values
-
-
-def feature_to_raster_window(raster, feature):
+    if pixels is None:
+        pixels = rasterutils.read(raster, band, offset[0], offset[1], resolution[0], resolution[1])
+    # pull raster values where feature presence exists (numpy stores axes as rows then columns)
+    presence = numpy.asarray(mask)[:resolution[1], :resolution[0]] > 0
+    values = numpy.asarray(pixels)[:resolution[1], :resolution[0]][presence]
+    if ignore_values is None:
+        return values
+    if callable(ignore_values):
+        keep = numpy.fromiter((not ignore_values(v) for v in values), dtype=bool, count=values.size)
+    else:
+        ignore_values = numpy.asarray(ignore_values).ravel()
+        if values.dtype.kind in 'iu':
+            # compare in native integer type rather than promoting pixels (ignore values not representable in it can
+            # never match anyways)
+            info = numpy.iinfo(values.dtype)
+            representable = (ignore_values >= info.min) & (ignore_values <= info.max)
+            if ignore_values.dtype.kind == 'f':
+                representable &= ignore_values == numpy.floor(ignore_values)
+            ignore_values = ignore_values[representable].astype(values.dtype)
+        if not ignore_values.size:
+            return values
+        keep = ~numpy.isin(values, ignore_values)
+        # NaN never compares equal, so has to be matched separately
+        if ignore_values.dtype.kind == 'f' and numpy.isnan(ignore_values).any():
+            keep &= ~numpy.isnan(values)
+    return values[keep]
+
+
+def feature_to_raster_window(raster, feature, transform=None):
     '''
     Given a feature which overlaps a raster, find the geotransformation for the pixel window of the overlap, snapping to
     the raster grid and pixel size.
     :param raster: (gdal.Dataset) The GDAL Dataset
     :param feature: (ogr.Feature) The OGR Feature
+    :param [transform]: (list[]) The raster transform, as returned by `rasters.get_transform()`. If not supplied, it is
+           read from the raster (supply when calling repeatedly on the same raster to skip reading it each time).
     :return: Tuple of origin (as float[]), resolution (as int[]), x/y-offsets (as int[]), and pixel sizes (as float[])
              corresponding to window on raster that overlaps the feature provided.
     '''
     # get raster information
-    origin, pixel_size, extent = rasterutils.get_transform(raster)
+    origin, pixel_size, extent = transform if transform is not None else rasterutils.get_transform(raster)
     width = extent[0]
     height = extent[1]
-    raster_band = raster.GetRasterBand(1)
     # get feature information
     xmin, xmax, ymin, ymax = featutils.get_extent(feature)
     # snap x-origin to raster grid and crop to minimum corner
@@ -176,13 +224,13 @@ def feature_to_raster_window(raster, feature):
     if pixel_size[1] < 0:
         resolution[1] = -resolution[1]
     # outside of extent return empty array
-    if xoffset > raster_band.XSize or yoffset > raster_band.YSize:
+    if xoffset > width or yoffset > height:
         return None, None, None, None
     # adjust extent to fit within raster
-    if xoffset + resolution[0] > raster_band.XSize:
-        resolution[0] = raster_band.XSize - xoffset
-    if yoffset + resolution[1] > raster_band.YSize:
-        resolution[1] = raster_band.YSize - yoffset
+    if xoffset + resolution[0] > width:
+        resolution[0] = width - xoffset
+    if yoffset + resolution[1] > height:
+        resolution[1] = height - yoffset
     # flat resolution after adjusting, return empty array
     if resolution[0] <= 0 or resolution[1] <= 0:
         return None, None, None, None
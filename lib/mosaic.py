@@ -1,40 +1,145 @@
-import sys
-from . import gdal_merge
+from osgeo import gdal
 from .. import rasters as rasterutils
 
 
+# number of values following each supported `gdal_merge` option
+_MERGE_ARG_COUNTS = {
+    "-of":       1,
+    "-f":        1,
+    "-co":       1,
+    "-ot":       1,
+    "-ps":       2,
+    "-ul_lr":    4,
+    "-init":     1,
+    "-n":        1,
+    "-a_nodata": 1,
+    "-tap":      0,
+    "-separate": 0,
+    "-seperate": 0,
+    "-pct":      0,
+    "-q":        0,
+    "-quiet":    0,
+    "-v":        0
+}
+
+
 def rasters(input_file_list, output_filepath, no_data_value=None, additional_args=None, open=False):
     '''
-    Mosaic rasters. Basically a function wrapper for the `gdal_merge` program. Automatically copies raster color table,
-    if one exists in the first band of first raster.
+    Mosaic rasters. Takes the same options as the `gdal_merge` program, but builds a virtual mosaic of the inputs with
+    `gdal.BuildVRT` then writes it out with `gdal.Translate`. As with `gdal_merge`, output pixel size is taken from the
+    first raster unless specified. Raster color table is carried over from the first raster, if one exists.
     :param input_file_list: (str[]) List of rasters to mosaic as filepaths.
     :param output_filepath: (str) Output filepath.
-    :param [no_data_value]: (number) No data value.
-    :param [additional_args]: (str[]) List of additional arguments. See <https://gdal.org/programs/gdal_merge.html> for
-           full documentation.
+    :param [no_data_value]: (number) No data value (pixels of which are ignored in input rasters).
+    :param [additional_args]: (dict|str[]) Additional `gdal_merge` arguments, as key/value pairs (flags with value of
+           None or True, or False to leave out, multiple values as list) or list of arguments. See
+           <https://gdal.org/programs/gdal_merge.html> for full documentation. Supported options are -of, -co, -ot, -ps,
+           -ul_lr, -init, -n, -a_nodata, -tap, -separate, -pct, -q, and -v. Throws exception for other options (e.g.
+           -createonly).
     :param [open=False]: (boolean) If true, will open and return the resulting raster dataset.
     :return: (gdal.Dataset) Dataset instance of mosaiced raster.
     '''
-    # first arguments (empty then output)
-    args = ["", "-o", output_filepath]
-    # add optional supplied no data value
-    if no_data_value is not None:
-        args += ["-n", str(no_data_value)]
-    # auto grab some arguments from first input file
-    first_raster = rasterutils.get_dataset(input_file_list[0])
-    first_raster_band = first_raster.GetRasterBand(1)
-    if additional_args is not None:
-        # additional arguments added as key/value pairs
-        for key, value in additional_args.iteritems():
-            args += [key, value]
-    # copy over some automatic arguments if they do not exist in supplied
-    # mask no data value
-    # if (not additional_args or "-n" not in additional_args) and no_data_value is None and first_raster_band.GetNoDataValue() is not None:
-    #     args += ["-n", str(first_raster_band.GetNoDataValue())]
-    # add color table if it exists
-    if (not additional_args or "-pct" not in additional_args) and first_raster_band.GetRasterColorTable() is not None:
-        args += ["-pct"]
-    sys.argv = args + input_file_list
-    gdal_merge.main()
+    merge_args = _parse_merge_args(additional_args)
+    if "-n" in merge_args:
+        no_data_value = float(merge_args["-n"][0])
+
+    # default pixel size to first raster, as gdal_merge does (BuildVRT otherwise averages the input resolutions)
+    if "-ps" in merge_args:
+        x_res, y_res = [abs(float(v)) for v in merge_args["-ps"]]
+    else:
+        first_raster = rasterutils.get_dataset(input_file_list[0])
+        origin, pixel_size, extent = rasterutils.get_transform(first_raster)
+        x_res, y_res = abs(pixel_size[0]), abs(pixel_size[1])
+        del first_raster
+
+    vrt_options = {
+        'resolution':          'user',
+        'xRes':                x_res,
+        'yRes':                y_res,
+        'targetAlignedPixels': "-tap" in merge_args,
+        'separate':            "-separate" in merge_args or "-seperate" in merge_args,
+        # without -n, inputs' own no data values are not treated as transparent (gdal_merge copies them over as is)
+        'srcNodata':           no_data_value if no_data_value is not None else "None"
+    }
+    if "-ul_lr" in merge_args:
+        ulx, uly, lrx, lry = [float(v) for v in merge_args["-ul_lr"]]
+        vrt_options['outputBounds'] = (ulx, lry, lrx, uly)
+    # areas not covered by any input are filled with init value(s), or zero, as in gdal_merge
+    if "-init" in merge_args or no_data_value is not None:
+        vrt_options['VRTNodata'] = merge_args["-init"][0] if "-init" in merge_args else 0
+
+    vrt_path = "/vsimem/_mosaic_{0}.vrt".format(id(input_file_list))
+    vrt = gdal.BuildVRT(vrt_path, input_file_list, **vrt_options)
+
+    if "-of" in merge_args or "-f" in merge_args:
+        driver_name = (merge_args.get("-of") or merge_args["-f"])[0]
+    else:
+        driver_name = rasterutils.guess_driver(output_filepath)
+    creation_options = list(merge_args.get("-co", []))
+    if not creation_options and driver_name == rasterutils.GEOTIFF_DRIVER_NAME:
+        creation_options = ['TILED=YES', 'COMPRESS=LZW', 'NUM_THREADS=ALL_CPUS', 'BIGTIFF=IF_SAFER']
+    translate_options = {
+        'format':          driver_name,
+        'creationOptions': creation_options,
+        # as in gdal_merge, output no data value is only set if explicitly given
+        'noData':          merge_args["-a_nodata"][0] if "-a_nodata" in merge_args else "none"
+    }
+    if "-ot" in merge_args:
+        translate_options['outputType'] = gdal.GetDataTypeByName(merge_args["-ot"][0])
+        if translate_options['outputType'] == gdal.GDT_Unknown:
+            raise Exception("Unknown GDAL data type: {0}".format(merge_args["-ot"][0]))
+
+    try:
+        mosaic = gdal.Translate(output_filepath, vrt, **translate_options)
+        # dereference to flush and close
+        del mosaic
+    finally:
+        del vrt
+        gdal.Unlink(vrt_path)
+
     if open:
         return rasterutils.get_dataset(output_filepath)
+
+
+def _parse_merge_args(additional_args):
+    '''
+    Parse `gdal_merge` arguments into dictionary of option to list of values.
+    :param additional_args: (dict|str[]) Arguments as key/value pairs or list of arguments.
+    :return: (dict) Dictionary of option to list of values (repeated options, i.e. -co, are appended).
+    '''
+    args = []
+    if isinstance(additional_args, dict):
+        for key, value in additional_args.items():
+            # flags given as False are off, so left out entirely
+            if value is False:
+                continue
+            if value is None or value is True:
+                args.append(key)
+            elif isinstance(value, (list, tuple)):
+                if key == "-init":
+                    # multiple init values are given to gdal_merge as single, space-delimited argument
+                    args += [key, " ".join(str(v) for v in value)]
+                elif _MERGE_ARG_COUNTS.get(key) == 1:
+                    # single-value options given multiple values are repeated (i.e. -co)
+                    for v in value:
+                        args += [key, str(v)]
+                else:
+                    args += [key] + [str(v) for v in value]
+            else:
+                args += [key, str(value)]
+    elif additional_args:
+        args = [str(arg) for arg in additional_args]
+
+    parsed = {}
+    i = 0
+    while i < len(args):
+        option = args[i]
+        if option not in _MERGE_ARG_COUNTS:
+            raise Exception("Unsupported mosaic argument: {0}".format(option))
+        num_values = _MERGE_ARG_COUNTS[option]
+        values = args[i+1:i+1+num_values]
+        if len(values) != num_values:
+            raise Exception("Mosaic argument {0} requires {1} value(s)".format(option, num_values))
+        parsed.setdefault(option, []).extend(values)
+        i += 1 + num_values
+    return parsed
@@ -1,11 +1,15 @@
 import os
-import math
-from osgeo import gdal, ogr, osr
+from osgeo import gdal, gdal_array, ogr, osr
 from ._getlayer import get as _get_layer
 from .. import rasters
 from .. import features as featutils
 
 
+# coordinate transformations keyed by (from, to) spatial reference WKT and data axis mapping, as construction requires
+# PROJ initialization (axis mapping included as WKT alone does not distinguish lat/lon from lon/lat data order)
+_TRANSFORM_CACHE = {}
+
+
 def features(input_datasource, output_path, to_srs, overwrite=False):
     '''
     Reproject a feature datasource.
@@ -15,113 +19,200 @@ def features(input_datasource, output_path, to_srs, overwrite=False):
     :param to_srs: (osr.SpatialReference) The spatial reference to reproject to.
     :param [overwrite=False]: (boolean) If False, throws exception is output path already exists. Otherwise overwrites
            silently.
-    :return:
+    :return: (ogr.DataSource) The DataSource instance of the reprojected datasource.
     '''
     input_layer, ds  = _get_layer(input_datasource, allow_path=True)
     input_datasource = input_datasource if not ds else input_datasource
-    layer_defn       = input_layer.GetLayerDefn()
 
-    from_srs  = input_layer.GetSpatialRef()
-    transform = osr.CoordinateTransformation(from_srs, to_srs)
+    if ds:
+        # opened from filepath, so let GDAL translate the layer natively (transforms and field copies done in C)
+        layer_name = input_layer.GetName()
+        ds.Release()
+        del input_layer, ds
+        return _translate_features(input_datasource, layer_name, output_path, to_srs, overwrite)
+
+    # transform in traditional GIS (x/y, i.e. lon/lat) axis order, as gdal.VectorTranslate does for filepath inputs,
+    # using clones so the caller's spatial references are left untouched
+    from_srs = input_layer.GetSpatialRef().Clone()
+    from_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    trad_to_srs = to_srs.Clone()
+    trad_to_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    transform = _get_coordinate_transformation(from_srs, trad_to_srs)
 
     reproj_ds    = featutils.copy_datasource_as_empty(input_datasource, output_path, overwrite=overwrite, new_srs=to_srs)
     reproj_layer = reproj_ds.GetLayer()
-
-    in_feature = input_layer.GetNextFeature()
-    while in_feature:
-        geom = in_feature.GetGeometryRef()
+    reproj_defn  = reproj_layer.GetLayerDefn()
+
+    # batch writes in a single transaction (no-op for drivers without transaction support)
+    reproj_layer.StartTransaction()
+    input_layer.ResetReading()
+    for in_feature in input_layer:
+        # copy fields and geometry in one call, then transform the copied geometry
+        reproj_feature = ogr.Feature(reproj_defn)
+        reproj_feature.SetFrom(in_feature)
+        geom = reproj_feature.GetGeometryRef()
         if geom:
             geom.Transform(transform)
-
-        reproj_feature = ogr.Feature(layer_defn)
-        reproj_feature.SetGeometry(geom)
-        for i in range(layer_defn.GetFieldCount()):
-            reproj_feature.SetField(layer_defn.GetFieldDefn(i).GetNameRef(), in_feature.GetField(i))
         reproj_layer.CreateFeature(reproj_feature)
+    reproj_layer.CommitTransaction()
+    input_layer.ResetReading()
 
-        in_feature = input_layer.GetNextFeature()
+    return reproj_ds
 
-    if ds:
-        ds.Release()
-        del input_layer, ds, input_datasource
 
-    return reproj_ds
+def _get_coordinate_transformation(from_srs, to_srs):
+    '''
+    Get coordinate transformation between two spatial references, reusing one previously created for the same pair.
+    :param from_srs: (osr.SpatialReference) The spatial reference to transform from.
+    :param to_srs: (osr.SpatialReference) The spatial reference to transform to.
+    :return: (osr.CoordinateTransformation)
+    '''
+    key = (
+        from_srs.ExportToWkt(), tuple(from_srs.GetDataAxisToSRSAxisMapping()),
+        to_srs.ExportToWkt(),   tuple(to_srs.GetDataAxisToSRSAxisMapping())
+    )
+    transform = _TRANSFORM_CACHE.get(key)
+    if transform is None:
+        transform = _TRANSFORM_CACHE[key] = osr.CoordinateTransformation(from_srs, to_srs)
+    return transform
+
+
+def _translate_features(input_path, layer_name, output_path, to_srs, overwrite=False):
+    '''
+    Reproject a feature layer from filepath using `gdal.VectorTranslate`.
+    :param input_path: (str) Filepath of the feature datasource.
+    :param layer_name: (str) Name of the layer to reproject.
+    :param output_path: (str) The output path to write the reprojected feature datasource.
+    :param to_srs: (osr.SpatialReference) The spatial reference to reproject to.
+    :param [overwrite=False]: (boolean) If False, throws exception is output path already exists. Otherwise overwrites
+           silently.
+    :return: (ogr.DataSource) The DataSource instance of the reprojected datasource.
+    '''
+    if os.path.exists(output_path):
+        if not overwrite:
+            raise Exception("{0} already exists (to overwrite, set overwrite=True)".format(output_path))
+        featutils.get_driver(output_path).DeleteDataSource(output_path)
+
+    translated = gdal.VectorTranslate(
+        output_path,
+        input_path,
+        format=featutils.guess_driver(output_path),
+        layers=[layer_name],
+        dstSRS=to_srs.ExportToWkt(),
+        reproject=True
+    )
+    # dereference to flush and close before reopening as OGR datasource
+    del translated
+
+    return featutils.get_datasource(output_path, write=True)
 
 
 def raster(input_raster, output_path, gdal_data_type=None, to_srs=None, new_cellsize=None,
-                    interpolation=gdal.GRA_NearestNeighbour, overwrite=False):
+                    interpolation=gdal.GRA_NearestNeighbour, overwrite=False, inplace_array=None):
     '''
     Reproject or resample a raster dataset.
     :param input_raster: (gdal.Dataset) The raster dataset to reproject/resample.
-    :param output_path: (str) The filepath to save the reprojected/resampled raster.
+    :param output_path: (str) The filepath to save the reprojected/resampled raster. If None, the raster is created in
+           memory instead.
     :param [gdal_data_type]: (int) If provided, the new data type for the raster, which must be value corresponding to
-           gdal data type constant (e.g. `gdal.GDT_UInt16`).
+           gdal data type constant (e.g. `gdal.GDT_UInt16`). Otherwise uses data type of the input raster.
     :param [to_srs]: (osr.SpatialReference) If provided, the new spatial referenced to reproject to.
-    :param [new_cellsize]: (float[]) If provided, the new cellsize to resample at.
+    :param [new_cellsize]: (float[]) If provided, the new cellsize to resample at. Otherwise keeps the input pixel size
+           if not reprojecting, or if reprojecting, uses the cellsize GDAL computes to roughly preserve the input
+           resolution in the new spatial reference.
     :param [interpolation=gdal.GRA_NearestNeighbour]: The interpolation method used to reproject/resample the data. Must be
            value corresponding to valid gdal constant (e.g. `gdal.GRA_Bilinear`).
     :param [overwrite=False]: (boolean) If False, throws exception is output path already exists. Otherwise overwrites
            silently.
-    :return: (gdal.Dataset) The Dataset instance of the reprojected/resampled raster.
+    :param [inplace_array]: (numpy.Array) An array to write the reprojected raster directly into (in memory, so cannot
+           be supplied along with an output path), avoiding an intermediate copy. Must be C-contiguous, shaped (bands,
+           rows, columns) or (rows, columns) for single band rasters, match the reprojected size and band count, and be
+           kept in scope for as long as the returned dataset is used. Data type is taken from the array. Pixels not
+           covered by the input raster are set to the no data value, or zero if the input band has none.
+    :return: (gdal.Dataset) The Dataset instance of the reprojected/resampled raster. No data values and color tables
+             are carried over from the input raster.
     '''
-    from_srs_wkt = input_raster.GetProjectionRef()
-    from_srs = osr.SpatialReference()
-    from_srs.ImportFromWkt(from_srs_wkt)
-    if to_srs:
-        transform = osr.CoordinateTransformation(from_srs, to_srs)
-    else:
-        transform = None
-        to_srs = from_srs
+    warp_options = {
+        'dstSRS':       to_srs.ExportToWkt() if to_srs else None,
+        'xRes':         abs(new_cellsize[0]) if new_cellsize else None,
+        'yRes':         abs(new_cellsize[1]) if new_cellsize else None,
+        'resampleAlg':  interpolation,
+        'outputType':   gdal_data_type if gdal_data_type is not None else gdal.GDT_Unknown,
+        'multithread':  True,
+        'warpOptions':  ['NUM_THREADS=ALL_CPUS']
+    }
+
+    if output_path and inplace_array is not None:
+        raise Exception("Supply either output path or in-place array, not both")
+
+    if output_path:
+        driver_name = rasters.guess_driver(output_path)
+        if os.path.exists(output_path):
+            if not overwrite:
+                raise Exception("{0} already exists (to overwrite, set overwrite=True)".format(output_path))
+            # let driver remove existing dataset (and any sidecar files)
+            rasters.get_driver(output_path).Delete(output_path)
+        creation_options = []
+        if driver_name == rasters.GEOTIFF_DRIVER_NAME:
+            creation_options = ['TILED=YES', 'COMPRESS=LZW', 'BIGTIFF=IF_SAFER']
+        reproj_raster = gdal.Warp(output_path, input_raster, format=driver_name, creationOptions=creation_options,
+                                  **warp_options)
+
+    elif inplace_array is not None:
+        # warp to virtual raster first to resolve output grid without processing any pixels
+        warped_vrt = gdal.Warp("", input_raster, format="VRT", **warp_options)
+        array_shape = inplace_array.shape if inplace_array.ndim == 3 else (1,) + inplace_array.shape
+        vrt_shape = (warped_vrt.RasterCount, warped_vrt.RasterYSize, warped_vrt.RasterXSize)
+        if tuple(array_shape) != vrt_shape:
+            raise Exception("In-place array shape {0} does not match reprojected raster shape {1}".format(
+                tuple(array_shape), vrt_shape
+            ))
+        reproj_raster = _mem_dataset_from_array(inplace_array, warped_vrt.GetGeoTransform(), warped_vrt.GetProjection())
+        del warped_vrt
+        for b in range(input_raster.RasterCount):
+            band = input_raster.GetRasterBand(b+1)
+            reproj_band = reproj_raster.GetRasterBand(b+1)
+            no_data_val = band.GetNoDataValue()
+            # clear array (which may hold prior values) so pixels outside the input raster are not left as is
+            if no_data_val is not None:
+                reproj_band.SetNoDataValue(no_data_val)
+                reproj_band.Fill(no_data_val)
+            else:
+                reproj_band.Fill(0)
+            color_table = band.GetColorTable()
+            if color_table is not None:
+                reproj_band.SetColorTable(color_table)
+        gdal.Warp(reproj_raster, input_raster, resampleAlg=interpolation, multithread=True,
+                  warpOptions=['NUM_THREADS=ALL_CPUS'])
 
-    driver = rasters.get_driver(output_path)
-    if os.path.exists(output_path):
-        if not overwrite:
-            raise Exception("{0} already exists (to overwrite, set overwrite=True)".format(output_path))
-        driver.Delete(output_path)
-
-    origin, pixel_size, extent = rasters.get_transform(input_raster)
-    far_corner = [origin[0] + pixel_size[0] * extent[0], origin[1] + pixel_size[1] * extent[1]]
-
-    reproj_top_left = transform.TransformPoint(origin[0], origin[1]) if transform else (origin[0], origin[1])
-    reproj_btm_left = transform.TransformPoint(origin[0], far_corner[1]) if transform else (origin[0], far_corner[1])
-    reproj_top_right = transform.TransformPoint(origin[0], origin[1]) if transform else (origin[0], origin[1])
-    reproj_btm_right = transform.TransformPoint(far_corner[0], origin[1]) if transform else (far_corner[0], origin[1])
-
-    min_max_x = [
-        reproj_top_left[0] if reproj_top_left[0] < reproj_btm_left[0] else reproj_btm_left[0],
-        reproj_top_right[0] if reproj_top_right[0] > reproj_btm_right[0] else reproj_btm_right[0]
-    ]
-    min_max_y = [
-        reproj_btm_left[1] if reproj_btm_left[1] < reproj_btm_right[1] else reproj_btm_right[1],
-        reproj_top_left[1] if reproj_top_left[1] > reproj_top_right[1] else reproj_top_right[1]
-    ]
-
-    reproj_origin = [
-        min_max_x[0] if pixel_size[0] > 0 else min_max_x[1],
-        min_max_y[0] if pixel_size[1] > 0 else min_max_y[1]
-    ]
-    if not new_cellsize:
-        new_cellsize[0] = pixel_size[0]
-        new_cellsize[1] = pixel_size[1]
-    reproj_width = abs(math.ceil((min_max_x[1] - min_max_x[0]) / float(new_cellsize[0])))
-    reproj_height = abs(math.ceil((min_max_y[1] - min_max_y[0]) / float(new_cellsize[1])))
-
-    reproj_raster = driver.Create(output_path, int(reproj_width), int(reproj_height), input_raster.RasterCount, gdal_data_type)
-    reproj_raster.SetGeoTransform(rasters.create_transform(reproj_origin, new_cellsize))
-    reproj_raster.SetProjection(to_srs.ExportToWkt())
-
-    rpe = gdal.ReprojectImage(input_raster, reproj_raster, from_srs.ExportToWkt(), to_srs.ExportToWkt(), interpolation)
-
-    check_color_table = gdal_data_type == gdal.GDT_UInt16 or gdal_data_type == gdal.GDT_Byte
-    for b in range(input_raster.RasterCount):
-        band = input_raster.GetRasterBand(b+1)
-        reproj_band = reproj_raster.GetRasterBand(b+1)
-        no_data_val = band.GetNoDataValue()
-        if no_data_val is not None:
-            reproj_band.SetNoDataValue(no_data_val)
-        if check_color_table:
-            color_table = band.GetRasterColorTable()
-            if color_table:
-                reproj_band.SetRasterColorTable(color_table)
+    else:
+        reproj_raster = gdal.Warp("", input_raster, format="MEM", **warp_options)
 
     return reproj_raster
+
+
+def _mem_dataset_from_array(array, geo_transform, srs_wkt):
+    '''
+    Create an in-memory (MEM driver) raster dataset whose bands point directly at the buffer of a NumPy array, such that
+    anything written to the dataset is written straight into the array.
+    :param array: (numpy.Array) C-contiguous array shaped (bands, rows, columns) or (rows, columns).
+    :param geo_transform: (float[]) The raster transform parameters.
+    :param srs_wkt: (str) The spatial reference as WKT.
+    :return: (gdal.Dataset)
+    '''
+    if array.ndim == 2:
+        array = array.reshape((1,) + array.shape)
+    if not array.flags['C_CONTIGUOUS']:
+        raise Exception("Array must be C-contiguous to be used as raster buffer")
+    num_bands, height, width = array.shape
+    data_type = gdal_array.NumericTypeCodeToGDALTypeCode(array.dtype)
+    dataset = gdal.GetDriverByName("MEM").Create("", width, height, 0, data_type)
+    for b in range(num_bands):
+        dataset.AddBand(data_type, options=[
+            "DATAPOINTER={0}".format(array[b].ctypes.data),
+            "PIXELOFFSET={0}".format(array.strides[2]),
+            "LINEOFFSET={0}".format(array.strides[1])
+        ])
+    dataset.SetGeoTransform(geo_transform)
+    dataset.SetProjection(srs_wkt)
+    return dataset
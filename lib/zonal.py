@@ -1,8 +1,12 @@
+import concurrent.futures
 import math
-from osgeo import gdal
+import os
+import numpy
+from osgeo import gdal, gdal_array, ogr
 from ..Field import Field
 from ._getlayer import get as _get_layer
 from .. import fields
+from .. import features as featutils
 from .. import rasters as rasterutils
 from . import conversion
 from . import extract
@@ -12,7 +16,10 @@ def statistics(feature_data, rasters, bands=None,
                statistics=("MIN", "MAX", "MEAN", "MEDIAN", "VARIANCE", "STDEV", "PERC90"),
                ignore_values=None,
                unique_field=None,
-               name_field=None):
+               name_field=None,
+               n_workers=1,
+               as_columns=False,
+               overlapping_only=False):
     '''
     Calculate zonal statistics for each feature in a given feature layer on one or more rasters
     :param feature_data: (str) Feature data as filepath, OGR Dataset, or OGR Layer.
@@ -30,8 +37,19 @@ def statistics(feature_data, rasters, bands=None,
            table. If not supplied, will attempt to find common unique field names ("OID", "FID", "OBJECTID", etc.) but
            script will fail if no unique field can be ascertained.
     :param [name_field]: (str) An optional field name to include in the outputs.
-    :return: (dict[]) Table of results as an array of dictionaries (with keys being column names). Columns will be the
-            unique-field, the pixel count, then the statistics requested.
+    :param [n_workers=1]: (int) Number of worker processes to split features across. If more than one, rasters are
+           reopened by filepath in each worker, so rasters must be file-based (not in-memory or /vsimem/) and any
+           ignore values callback must be picklable (i.e. a module-level function, not a lambda). On platforms where
+           processes are spawned (Windows and macOS), the calling script must guard its entry point with
+           `if __name__ == "__main__":`, as each worker re-imports the main module.
+    :param [as_columns=False]: (boolean) If true, return the table as columns instead of rows.
+    :param [overlapping_only=False]: (boolean) If true, features outside the combined extent of the rasters are left out
+           of the results entirely (instead of included with zero counts), letting the driver skip reading them using
+           its spatial index, if available.
+    :return: (dict[]|dict) Table of results as an array of dictionaries (with keys being column names). Columns will be
+            the unique-field, the pixel count, then the statistics requested. If `as_columns`, instead a single
+            dictionary of column names to column values (as list for field values and NumPy arrays for counts and
+            statistics), e.g. for direct use with `pandas.DataFrame`.
     '''
     if rasters is None:
         raise Exception("No rasters supplied")
@@ -40,23 +58,42 @@ def statistics(feature_data, rasters, bands=None,
         rasters = [rasters]
     elif len(rasters) == 0:
         raise Exception("No rasters supplied")
+    opened = {}
     for i in range(len(rasters)):
         rast = rasters[i]
         if rast is None:
             continue
-        # if string given, try to open as filepath to a raster
+        # if string given, try to open as filepath to a raster (reusing the dataset if same filepath given again)
         if isinstance(rast, str):
-            rasters[i] = rasterutils.get_dataset(rast)
+            if rast not in opened:
+                opened[rast] = rasterutils.get_dataset(rast)
+            rasters[i] = opened[rast]
         else:
             assert isinstance(rast, gdal.Dataset)
 
+    # workers reopen rasters by filepath, so check up front that each can be (in-memory rasters exist only here)
+    if n_workers > 1:
+        for rast in rasters:
+            if rast is None:
+                continue
+            path = rast.GetDescription()
+            if (
+                not path or rast.GetDriver().ShortName == "MEM" or path.startswith("/vsimem/") or
+                (not path.startswith("/vsi") and not os.path.exists(path))
+            ):
+                raise ValueError(
+                    "Raster '{0}' cannot be reopened by filepath for n_workers > 1, use n_workers=1 for in-memory "
+                    "rasters".format(path)
+                )
+
     if bands is None:
         # if no bands supplied, assume first band for every raster
         bands = [1] * len(rasters)
     else:
         # bands must be list of bands as number or single band number
-        if isinstance(bands, (list, tuple)):
+        if not isinstance(bands, (list, tuple)):
             bands = [bands]
+        bands = list(bands)
         for band in bands:
             assert isinstance(band, int)
         if len(bands) != len(rasters):
@@ -66,28 +103,6 @@ def statistics(feature_data, rasters, bands=None,
             else:
                 raise Exception("Inconsistent number of rasters and bands given")
 
-    # check if all rasters are alike (if they are we can save some calculations down the road)
-    identical_rasters = True
-    check_transform = None
-    for rast in rasters:
-        if rast is None:
-            continue
-        origin, pixel_size, extent = rasterutils.get_transform(rast)
-        width = extent[0]
-        height = extent[1]
-        if check_transform is None:
-            check_transform = {
-                'origin': origin,
-                'pixel_size': pixel_size,
-                'width': width,
-                'height': height
-            }
-        else:
-            if (origin != check_transform['origin'] or pixel_size != check_transform['pixel_size']
-                    or width != check_transform['width'] or height != check_transform['height']):
-                identical_rasters = False
-                break
-
     # correct ignore value(s)
     if ignore_values or ignore_values == 0:
         if not callable(ignore_values):
@@ -95,6 +110,8 @@ def statistics(feature_data, rasters, bands=None,
                 ignore_values = [ignore_values]
             for val in ignore_values:
                 assert isinstance(val, (int, float))
+            # convert once to sorted, deduplicated array for vectorized lookup against pixels
+            ignore_values = numpy.unique(ignore_values)
 
     # get feature layer object
     feature_layer, feature_data = _get_layer(feature_data)
@@ -116,54 +133,81 @@ def statistics(feature_data, rasters, bands=None,
     if len(_stats([], statistics)) != len(statistics):
         raise Exception("Unrecognized statistics type in parameters, check parameter/spelling")
 
-    count = 0    # loop counter for progress
-    table = []    # table (array of dictionaries) for results
-
-    # loop through features (reset iterator since gdal/ogr doesn't)
-    feature_layer.SetNextByIndex(0)
-    for feature in feature_layer:
-        row = {}
-        row[unique_field] = fields.value(feature, unique_field)
-        if name_field:
-            row[name_field] = fields.value(feature, name_field)
-
-        # if all rasters have same geotransform, we only need to get the window and polygon as array once so 
-        # pre-create
-        poly_array = offset = resolution = None
-        if identical_rasters:
-            for raster in rasters:
-                if raster is not None:
-                    origin, resolution, offset, pixel_size = extract.feature_to_raster_window(raster, feature)
-                    poly_array = conversion.feature.to_array(feature, origin, pixel_size, resolution)
-                    break
-
-        # empty list of pixels to be added to
-        pixels = []
-        # counts per raster
-        counts = {"count_total": 0}
-        # loop through rasters
-        for i in range(len(rasters)):
-            pixel_count = 0
-            if rasters[i] is not None:
-                if identical_rasters:
-                    # if identical, use the values already created
-                    add_pixels = extract.pixels_by_mask_array(rasters[i], bands[i], poly_array, offset, resolution, ignore_values)
-                else:
-                    # if not identical, create new window and feature as array for each raster just in case
-                    add_pixels = extract.pixels_by_feature_mask(rasters[i], bands[i], feature, ignore_values)
-                pixel_count = len(add_pixels)
-                pixels += add_pixels
-            if len(rasters) > 1:
-                counts["count_"+str(i+1)] = pixel_count
-            counts["count_total"] += pixel_count
-
-        # get count and statistics from list of pixels
-        row.update(counts)
-        row.update(_stats(pixels, statistics))
-
-        # append and iterate
-        table.append(row)
-        count += 1
+    # resolve field value getters once rather than dispatching on field type per feature
+    unique_value = fields.getter(unique_field)
+    name_value = fields.getter(name_field) if name_field else None
+
+    grids = _group_rasters(rasters, bands)
+    bounds = grids[3]
+    overlapping_only = overlapping_only and bounds is not None
+    if overlapping_only:
+        # keep any spatial filter the caller has set on the layer, narrowed to the raster bounds, and restore it after
+        prior_filter = feature_layer.GetSpatialFilter()
+        prior_filter = prior_filter.Clone() if prior_filter is not None else None
+        ring = ogr.Geometry(ogr.wkbLinearRing)
+        for x, y in ((bounds[0], bounds[2]), (bounds[1], bounds[2]), (bounds[1], bounds[3]), (bounds[0], bounds[3]),
+                     (bounds[0], bounds[2])):
+            ring.AddPoint_2D(x, y)
+        bounds_filter = ogr.Geometry(ogr.wkbPolygon)
+        bounds_filter.AddGeometry(ring)
+        if prior_filter is not None:
+            bounds_filter = bounds_filter.Intersection(prior_filter)
+        feature_layer.SetSpatialFilter(bounds_filter)
+
+    # table (array of dictionaries, or dictionary of columns) for results, with rows preallocated if the driver can
+    # give feature count cheaply (may be -1 otherwise, in which case rows are just appended)
+    if as_columns:
+        table = {}
+    else:
+        table = [None] * max(feature_layer.GetFeatureCount(force=0), 0)
+    count = 0    # loop counter for rows
+
+    try:
+        # loop through features (reset iterator since gdal/ogr doesn't)
+        feature_layer.ResetReading()
+        if n_workers > 1:
+            # features passed to workers as geometry WKB, as OGR/GDAL objects cannot be pickled
+            raster_paths = [None if rast is None else rast.GetDescription() for rast in rasters]
+            zone_ids = []
+            zone_features = []
+            for feature in feature_layer:
+                zone_ids.append((unique_value(feature), name_value(feature) if name_field else None))
+                zone_features.append(feature.GetGeometryRef().ExportToWkb())
+            batch_size = max(1, int(math.ceil(len(zone_features) / float(n_workers*4))))
+            batches = [zone_features[i:i+batch_size] for i in range(0, len(zone_features), batch_size)]
+            with concurrent.futures.ProcessPoolExecutor(max_workers=n_workers) as executor:
+                worker_args = ([raster_paths]*len(batches), [bands]*len(batches), batches,
+                               [statistics]*len(batches), [ignore_values]*len(batches))
+                results = [result for batch in executor.map(_batch_stats, *worker_args) for result in batch]
+            for (unique_id, name), result in zip(zone_ids, results):
+                row = {}
+                row[unique_field] = unique_id
+                if name_field:
+                    row[name_field] = name
+                row.update(result)
+                _add_row(table, row, count)
+                count += 1
+        else:
+            buffers = {}
+            for feature in feature_layer:
+                row = {}
+                row[unique_field] = unique_value(feature)
+                if name_field:
+                    row[name_field] = name_value(feature)
+                row.update(_feature_stats(feature, rasters, bands, grids, statistics, ignore_values, buffers))
+                _add_row(table, row, count)
+                count += 1
+    finally:
+        if overlapping_only:
+            feature_layer.SetSpatialFilter(prior_filter)
+    feature_layer.ResetReading()
+    if as_columns:
+        for key in table:
+            if key is not unique_field and key is not name_field:
+                table[key] = numpy.asarray(table[key])
+    else:
+        # trim any unfilled rows, in case feature count was overestimated
+        del table[count:]
 
     if feature_data:
         feature_data.Release()
@@ -172,10 +216,227 @@ def statistics(feature_data, rasters, bands=None,
     return table
 
 
+def _add_row(table, row, index):
+    '''
+    Add row of results to table, either as list of rows or dictionary of columns.
+    :param table: (dict[]|dict) The results table.
+    :param row: (dict) The row of results.
+    :param index: (int) The row index, filled in place if the list of rows was preallocated to include it.
+    '''
+    if isinstance(table, dict):
+        for key, value in row.items():
+            table.setdefault(key, []).append(value)
+    elif index < len(table):
+        table[index] = row
+    else:
+        table.append(row)
+
+
+def _group_rasters(rasters, bands):
+    '''
+    Group rasters by grid and collect bands used per dataset, for reuse across features.
+    :param rasters: (gdal.Dataset[]) List of rasters (may contain None).
+    :param bands: (int[]) List of bands corresponding to rasters.
+    :return: Tuple of grid key per raster, dictionary of first raster per grid key, dictionary of sorted bands used per
+             dataset id, and union of raster bounds (as x-min, x-max, y-min, y-max).
+    '''
+    # group rasters by grid (origin, pixel size, and extent), as rasters on the same grid share the same window and
+    # rasterized feature (saves rasterizing the feature once for every raster)
+    grid_keys = []
+    grid_rasters = {}
+    # union of raster bounds as x-min, x-max, y-min, y-max (features outside of which can skip raster work entirely)
+    bounds = None
+    for rast in rasters:
+        if rast is None:
+            grid_keys.append(None)
+            continue
+        origin, pixel_size, extent = rasterutils.get_transform(rast)
+        key = (tuple(origin), tuple(pixel_size), tuple(extent))
+        grid_keys.append(key)
+        if key not in grid_rasters:
+            grid_rasters[key] = rast
+            xs = sorted([origin[0], origin[0] + pixel_size[0]*extent[0]])
+            ys = sorted([origin[1], origin[1] + pixel_size[1]*extent[1]])
+            if bounds is None:
+                bounds = [xs[0], xs[1], ys[0], ys[1]]
+            else:
+                bounds = [min(bounds[0], xs[0]), max(bounds[1], xs[1]), min(bounds[2], ys[0]), max(bounds[3], ys[1])]
+
+    # collect the bands used for each dataset, as if same dataset is supplied multiple times (i.e. for different
+    # bands), the window for just those bands can be read at once
+    dataset_bands = {}
+    for rast, band in zip(rasters, bands):
+        if rast is not None:
+            dataset_bands.setdefault(id(rast), set()).add(band)
+    for key in dataset_bands:
+        dataset_bands[key] = sorted(dataset_bands[key])
+
+    return grid_keys, grid_rasters, dataset_bands, bounds
+
+
+def _batch_stats(raster_paths, bands, geometries_wkb, statistics, ignore_values):
+    '''
+    Calculate the counts and statistics for a batch of feature geometries, as run in a worker process.
+    :param raster_paths: (str[]) List of raster filepaths (may contain None).
+    :param bands: (int[]) List of bands corresponding to rasters.
+    :param geometries_wkb: (bytes[]) List of feature geometries as WKB.
+    :param statistics: (str[]) List of statistics to calculate.
+    :param ignore_values: (int[]|float[]|callback) Values to ignore when collecting pixels.
+    :return: (dict[]) List of counts and statistics per geometry.
+    '''
+    # reopen rasters, sharing the dataset where same filepath given again (as in main process)
+    opened = {}
+    for path in raster_paths:
+        if path is not None and path not in opened:
+            opened[path] = rasterutils.get_dataset(path)
+    rasters = [None if path is None else opened[path] for path in raster_paths]
+    grids = _group_rasters(rasters, bands)
+    buffers = {}
+    feature_defn = ogr.FeatureDefn()
+    results = []
+    for wkb in geometries_wkb:
+        feature = ogr.Feature(feature_defn)
+        feature.SetGeometry(ogr.CreateGeometryFromWkb(wkb))
+        results.append(_feature_stats(feature, rasters, bands, grids, statistics, ignore_values, buffers))
+    return results
+
+
+def _feature_stats(feature, rasters, bands, grids, statistics, ignore_values, buffers):
+    '''
+    Calculate the pixel counts and statistics for a single feature.
+    :param feature: (ogr.Feature) The feature defining the zone.
+    :param rasters: (gdal.Dataset[]) List of rasters (may contain None).
+    :param bands: (int[]) List of bands corresponding to rasters.
+    :param grids: (tuple) Raster grid groupings, as returned by `_group_rasters()`.
+    :param statistics: (str[]) List of statistics to calculate.
+    :param ignore_values: (int[]|float[]|callback) Values to ignore when collecting pixels.
+    :param buffers: (dict) Read buffers per raster index, reused (and grown as needed) across features.
+    :return: (dict) Dictionary of counts and statistics.
+    '''
+    grid_keys, grid_rasters, dataset_bands, bounds = grids
+
+    # get the window and polygon as array once per unique raster grid (skipped if feature is outside all rasters)
+    zones = dict.fromkeys(grid_rasters, (None, None, None))
+    xmin, xmax, ymin, ymax = featutils.get_extent(feature)
+    if bounds and xmin <= bounds[1] and xmax >= bounds[0] and ymin <= bounds[3] and ymax >= bounds[2]:
+        for key, raster in grid_rasters.items():
+            # grid key is the raster transform, so pass it along rather than reading it again per feature
+            origin, resolution, offset, pixel_size = extract.feature_to_raster_window(raster, feature, transform=key)
+            poly_array = conversion.feature.to_array(feature, origin, pixel_size, resolution)
+            zones[key] = (poly_array, offset, resolution)
+
+    # for datasets used for multiple bands, read window across only those bands in one call, then slice per band
+    band_windows = {}
+    for i in range(len(rasters)):
+        raster = rasters[i]
+        if raster is None or len(dataset_bands[id(raster)]) < 2 or id(raster) in band_windows:
+            continue
+        poly_array, offset, resolution = zones[grid_keys[i]]
+        if offset is not None:
+            band_windows[id(raster)] = raster.ReadAsArray(offset[0], offset[1], resolution[0], resolution[1],
+                                                          band_list=dataset_bands[id(raster)])
+
+    # pixel arrays per raster, concatenated once after all rasters are read
+    pixel_chunks = []
+    # counts per raster
+    counts = {"count_total": 0}
+    # loop through rasters
+    for i in range(len(rasters)):
+        pixel_count = 0
+        if rasters[i] is not None:
+            poly_array, offset, resolution = zones[grid_keys[i]]
+            window = band_windows.get(id(rasters[i]))
+            if window is not None:
+                window = window[dataset_bands[id(rasters[i])].index(bands[i])]
+            elif offset is not None:
+                window = _read_to_buffer(rasters[i], bands[i], offset, resolution, buffers, i)
+            add_pixels = extract.pixels_by_mask_array(rasters[i], bands[i], poly_array, offset, resolution,
+                                                      ignore_values, pixels=window)
+            pixel_count = add_pixels.size
+            pixel_chunks.append(add_pixels)
+        if len(rasters) > 1:
+            counts["count_"+str(i+1)] = pixel_count
+        counts["count_total"] += pixel_count
+
+    # get count and statistics from array of pixels (only combining pixels across rasters when ordered statistics
+    # require all values at once)
+    requested = _stats([], statistics)
+    if len(pixel_chunks) == 1:
+        counts.update(_stats(pixel_chunks[0], statistics))
+    elif 'median' in requested or 'perc90' in requested:
+        counts.update(_stats(numpy.concatenate(pixel_chunks) if pixel_chunks else numpy.empty(0), statistics))
+    else:
+        counts.update(_combined_stats(pixel_chunks, statistics))
+    return counts
+
+
+def _read_to_buffer(raster, band, offset, resolution, buffers, key):
+    '''
+    Read raster window into a reusable buffer, allocating a larger buffer only if the window does not fit.
+    :param raster: (gdal.Dataset) The raster dataset.
+    :param band: (int) The band number, starting at 1.
+    :param offset: (int[]) The x/y offset of the window.
+    :param resolution: (int[]) The pixel width and height of the window.
+    :param buffers: (dict) Read buffers, as flat arrays.
+    :param key: The key of the buffer to use in buffers.
+    :return: (numpy.Array) View of buffer filled with raster values and shaped to window.
+    '''
+    size = resolution[0]*resolution[1]
+    buffer = buffers.get(key)
+    if buffer is None or buffer.size < size:
+        dtype = gdal_array.GDALTypeCodeToNumericTypeCode(raster.GetRasterBand(band).DataType)
+        buffer = buffers[key] = numpy.empty(size, dtype=dtype)
+    window = buffer[:size].reshape(resolution[1], resolution[0])
+    return rasterutils.read(raster, band, offset[0], offset[1], resolution[0], resolution[1], buf_obj=window)
+
+
+def _combined_stats(pixel_chunks, options):
+    '''
+    Calculate statistics over multiple arrays of values as if concatenated, but without copying them into a combined
+    array. Only for statistics which do not require ordering all values (i.e. not MEDIAN or PERC90).
+    :param pixel_chunks: (numpy.Array[]) List of flat arrays of numeric values.
+    :param options: (str[]) List of statistics to calculate, as in `_stats()`.
+    :return: (dict) Dictionary of the requested statistics
+    '''
+    stats = _stats([], options)
+    count, mean, sum_sq_dev = 0, 0.0, 0.0
+    min_value = max_value = None
+    for chunk in pixel_chunks:
+        if not chunk.size:
+            continue
+        if 'min' in stats:
+            min_value = chunk.min() if min_value is None else min(min_value, chunk.min())
+        if 'max' in stats:
+            max_value = chunk.max() if max_value is None else max(max_value, chunk.max())
+        if 'mean' in stats or 'var' in stats or 'stdev' in stats:
+            chunk_mean = chunk.mean(dtype=numpy.float64)
+            # merge running mean and sum of squared deviations with those of the chunk (pairwise update)
+            delta = chunk_mean - mean
+            total = count + chunk.size
+            mean += delta*chunk.size/total
+            if 'var' in stats or 'stdev' in stats:
+                deviations = numpy.subtract(chunk, chunk_mean, dtype=numpy.float64)
+                sum_sq_dev += numpy.dot(deviations, deviations) + delta*delta*count*chunk.size/total
+        count += chunk.size
+    if not count:
+        return stats
+    if 'min' in stats:
+        stats['min'] = min_value
+    if 'max' in stats:
+        stats['max'] = max_value
+    if 'mean' in stats:
+        stats['mean'] = mean
+    if 'var' in stats:
+        stats['var'] = sum_sq_dev/count
+    if 'stdev' in stats:
+        stats['stdev'] = numpy.sqrt(sum_sq_dev/count)
+    return stats
+
+
 def _stats(pixel_values, options=("MIN", "MAX", "MEAN", "MEDIAN", "VARIANCE", "STDEV", "PERC90")):
     '''
     Calculate statistics on given list of values.
-    :param pixel_values: (int[]|float[]) Flat list of numeric values.
+    :param pixel_values: (numpy.Array|int[]|float[]) Flat array or list of numeric values.
     :param [options]: (str[]) List of statistics to calculate. Default calculates all. The recognized parameters are:
            MIN, MINIMUM - The minimum value
            MAX, MAXIMUM - The maximum value
@@ -184,7 +445,8 @@ def _stats(pixel_values, options=("MIN", "MAX", "MEAN", "MEDIAN", "VARIANCE", "S
            VAR, VARIANCE - The variance
            STDEV - The standard deviation
            PERC90 - The 90th percentile value
-    :return: (dict) Dictionary of the requested statistics
+    :return: (dict) Dictionary of the requested statistics. Min, max, and percentiles are in the data type of the values
+            given, while mean, variance, and standard deviation are accumulated in double precision.
     '''
     # capitalize options
     options = [stat.upper() for stat in options]
@@ -206,34 +468,36 @@ def _stats(pixel_values, options=("MIN", "MAX", "MEAN", "MEDIAN", "VARIANCE", "S
     # if empty array, return blank stats dict (but do after creating stats keys)
     if pixel_values is None or len(pixel_values) == 0:
         return stats
-    # prepare some variables for loop
-    mean = 0
-    num_vals = len(pixel_values)
-    # various statistics are derived off the mean which is calculated first
+    values = numpy.asarray(pixel_values)
+    # various statistics are derived off the mean (accumulated as double precision regardless of pixel data type)
     if calculate['mean'] or calculate['stdev'] or calculate['var']:
-        for val in pixel_values:
-            mean += float(val)/float(num_vals)
-    if calculate['mean']:
-        stats['mean'] = mean
-    # stats that require a secondary loop after mean calculation
+        mean = values.mean(dtype=numpy.float64)
+        if calculate['mean']:
+            stats['mean'] = mean
+    # variance reuses mean, with deviations taken in double precision (so dot product also sums in double precision,
+    # regardless of pixel data type)
     if calculate['stdev'] or calculate['var']:
-        variance = 0
-        for val in pixel_values:
-            variance += (float(val) - mean) ** 2 / float(num_vals)
+        deviations = numpy.subtract(values, mean, dtype=numpy.float64)
+        variance = numpy.dot(deviations, deviations) / deviations.size
         if calculate['var']:
             stats['var'] = variance
         if calculate['stdev']:
-            stats['stdev'] = variance ** 0.5
-    # stats that require a sorted array
-    if calculate['min'] or calculate['max'] or calculate['median'] or calculate['perc90']:
-        pixel_values.sort()
-        if calculate['min']:
-            stats['min'] = pixel_values[0]
-        if calculate['max']:
-            stats['max'] = pixel_values[-1]
-        if calculate['median'] and num_vals > 0:
-            stats['median'] = pixel_values[int(round(0.5*num_vals))-1]
-        if calculate['perc90'] and num_vals > 0:
-            stats['perc90'] = pixel_values[int(math.ceil(0.9*num_vals))-1]
+            stats['stdev'] = numpy.sqrt(variance)
+    # min/max as plain reductions, which are cheaper than selecting for them
+    if calculate['min']:
+        stats['min'] = values.min()
+    if calculate['max']:
+        stats['max'] = values.max()
+    # remaining order statistics taken by rank in one partition pass (so values are always actual pixel values), the
+    # median rank rounding half to even (as python round() does) and the 90th percentile by nearest-rank
+    ranks = {}
+    if calculate['median']:
+        ranks['median'] = max(int(round(0.5*values.size)) - 1, 0)
+    if calculate['perc90']:
+        ranks['perc90'] = int(math.ceil(0.9*values.size)) - 1
+    if ranks:
+        partitioned = numpy.partition(values, sorted(set(ranks.values())))
+        for key, rank in ranks.items():
+            stats[key] = partitioned[rank]
     # return stats dictionary
     return stats
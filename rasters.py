@@ -7,6 +7,9 @@ ERDAS_IMAGINE_DRIVER_NAME  = "HFA"
 GENERIC_BINARY_DRIVER_NAME = "GENBIN"
 ESRI_GRID_DRIVER_NAME      = "AAIGrid"
 
+# drivers by name, filled lazily as looked up
+_DRIVER_CACHE = {}
+
 
 def guess_driver(path):
     '''
@@ -29,7 +32,7 @@ def guess_driver(path):
 
 
 def driver(path):
-    return driver(path)
+    return get_driver(path)
 
 
 def get_driver(path):
@@ -39,7 +42,19 @@ def get_driver(path):
     :param path: (str) Filepath to raster.
     :return: (gdal.Driver)
     '''
-    return gdal.GetDriverByName(guess_driver(path))
+    return _get_driver_by_name(guess_driver(path))
+
+
+def _get_driver_by_name(name):
+    '''
+    Get raster driver by name, reusing the driver instance if already looked up.
+    :param name: (str) GDAL raster driver name.
+    :return: (gdal.Driver)
+    '''
+    driver = _DRIVER_CACHE.get(name)
+    if driver is None:
+        driver = _DRIVER_CACHE[name] = gdal.GetDriverByName(name)
+    return driver
 
 
 def dataset(rasterpath):
@@ -48,7 +63,7 @@ def dataset(rasterpath):
 
 def get_dataset(rasterpath):
     '''
-    Get raster dataset as gdal.Dataset instance.
+    Get raster dataset as gdal.Dataset instance. Raises RuntimeError if the raster cannot be opened.
     :param rasterpath: (str) The filepath to the raster.
     :return: (gdal.Dataset)
     '''
@@ -140,7 +155,7 @@ def get_no_data_value(dataset, band):
     return dataset.GetRasterBand(band).GetNoDataValue()
 
 
-def read(dataset, band, offset_x, offset_y, length_x=1, length_y=1):
+def read(dataset, band, offset_x, offset_y, length_x=1, length_y=1, buf_obj=None):
     '''
     Read and return raster values.
     :param dataset: (gdal.Dataset) The raster dataset.
@@ -149,6 +164,8 @@ def read(dataset, band, offset_x, offset_y, length_x=1, length_y=1):
     :param offset_y: Y-offset to start reading, in pixels.
     :param length_x: The window width, in number of pixels, to read.
     :param length_y: The window height, in number of pixels, to read.
+    :param [buf_obj]: (numpy.Array) If provided, an existing array (shaped as window height by width and matching band
+           data type) to read values into, instead of allocating a new array.
     :return: (numpy.Array) Two-dimension array of raster values corresponding to window size. Note array is returned as
              arr[y][x] to conform to NumPy conventions.
     '''
@@ -171,4 +188,4 @@ def read(dataset, band, offset_x, offset_y, length_x=1, length_y=1):
         raise Exception("Read length (y) cannot be negative")
     elif offset_y + length_y > height:
         raise Exception("Offset plus length (y) is greater than band height")
-    return read_band.ReadAsArray(offset_x, offset_y, length_x, length_y)
+    return read_band.ReadAsArray(offset_x, offset_y, length_x, length_y, buf_obj=buf_obj)
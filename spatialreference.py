@@ -1,3 +1,4 @@
+import functools
 from osgeo import osr
 
 
@@ -15,10 +16,16 @@ def epsg(epsg):
 
 def from_epsg(epsg):
     '''
-    Get osr.SpatialReference instance from EPSG number.
+    Get osr.SpatialReference instance from EPSG number. Instances are cached and shared between calls, so treat the
+    returned spatial reference as read-only (use `Clone()` first if it needs to be modified).
     :param epsg: (int) EPSG number
     :return: (osr.SpatialReference)
     '''
+    return _from_epsg(int(epsg))
+
+
+@functools.lru_cache(maxsize=64)
+def _from_epsg(epsg):
     srs = osr.SpatialReference()
     srs.ImportFromEPSG(epsg)
     return srs
@@ -1,5 +1,8 @@
 from osgeo import gdal, ogr
 
+# NOTE: importing this package switches GDAL/OGR to raise exceptions on errors (instead of returning None) for the whole
+# process, including any other code using GDAL/OGR alongside it. Functions in this package rely on this and do not
+# check for None results from GDAL/OGR calls.
 gdal.UseExceptions()
 ogr.UseExceptions()
 